@@ -12,7 +12,7 @@ import sys
 import copy
 
 from parse import parse, parse_gen, get_tokens, balanced
-from sexp import SExp
+from sexp import SExp, LazyCell, Delayed
 import error
 from primitives import *
 
@@ -52,8 +52,14 @@ def interpreter(d_list):
                 raise error.LispException(msg)
 
             #eval and print. the heart of the interpreter!
-            print bcolors.OKBLUE + " OUT: " + bcolors.ENDC + \
-                str(eval_lisp(sexp, SExp("NIL"), d_list))
+            result = [eval_lisp(sexp, SExp("NIL"), d_list)]
+            sys.stdout.write(bcolors.OKBLUE + " OUT: " + bcolors.ENDC)
+            #elements of a stream may fail while they are printed; end
+            #the line either way, so the error gets a line of its own
+            try:
+                print_sexp(result, sys.stdout)
+            finally:
+                print ""
             print ""
         except KeyboardInterrupt:
             print ""
@@ -187,6 +193,21 @@ def apply_lisp(function, args, a_list, d_list):
     if function in GREATER:
         check_args(function, args.length(), 2)
         return args.car().greater(args.cdr().car())
+    if function in STREAM_RANGE:
+        check_args(function, args.length(), 2)
+        return stream_range(args.car(), args.cdr().car())
+    if function in STREAM_LINES:
+        check_args(function, args.length(), 0)
+        return stream_lines(sys.stdin)
+    if function in STREAM_MAP:
+        check_args(function, args.length(), 2)
+        return stream_map(args.car(), args.cdr().car(), a_list, d_list)
+    if function in STREAM_FILTER:
+        check_args(function, args.length(), 2)
+        return stream_filter(args.car(), args.cdr().car(), a_list, d_list)
+    if function in STREAM_TAKE:
+        check_args(function, args.length(), 2)
+        return stream_take(args.car(), args.cdr().car())
     if function in HELP:
         check_args(function, args.length(), 0)
         print help_string
@@ -223,6 +244,110 @@ def evcond(be, a_list, d_list):
     return evcond(be.cdr(), a_list, d_list)
 
 
+def stream_range(low, high):
+    """Returns a lazy list of the integers from 'low' up to, but not
+    including, 'high'
+
+    """
+    if low.less(high).null():
+        return SExp("NIL")
+    return LazyCell(low, lambda: stream_range(low.plus(SExp("1")), high))
+
+
+def stream_lines(infile):
+    """Returns a lazy list of the lines of 'infile'. Each line is read
+    as a list of the s-expressions on it.
+
+    """
+    line = infile.readline()
+    if line == "":
+        return SExp("NIL")
+    tokens = get_tokens(line)
+    tokens.appendleft("(")
+    tokens.append(")")
+    sexp = parse(tokens)
+    if len(tokens) > 0:
+        msg = "extra tokens found: {0}".format(" ".join(tokens))
+        raise error.LispException(msg)
+    return LazyCell(sexp, lambda: stream_lines(infile))
+
+
+def stream_map(f, source, a_list, d_list):
+    """Returns a lazy list of the results of applying the function
+    named 'f' to each element of 'source'. Nothing is computed until
+    the result is looked at.
+
+    """
+    return Delayed(lambda: map_from(f, source, a_list, d_list))
+
+
+def map_from(f, source, a_list, d_list):
+    """Applies the function named 'f' to the first element of 'source',
+    leaving the rest to be mapped when it is needed
+
+    """
+    if source.null():
+        return SExp("NIL")
+    value = apply_lisp(f, SExp(source.car(), SExp("NIL")), a_list, d_list)
+    return LazyCell(value,
+                    lambda: map_from(f, source.cdr(), a_list, d_list))
+
+
+def stream_filter(f, source, a_list, d_list):
+    """Returns a lazy list of the elements of 'source' for which the
+    function named 'f' is not NIL. Nothing is scanned until the result
+    is looked at.
+
+    """
+    holder = [source]
+    return Delayed(lambda: filter_from(f, holder, False, a_list, d_list))
+
+
+def filter_from(f, holder, advance, a_list, d_list):
+    """Scans for the next element for which the function named 'f' is
+    not NIL, starting at the list in the one-element list 'holder', or
+    at its CDR if 'advance' is true.
+
+    The holder is emptied before the scan, so that nothing refers to
+    the elements already passed over and they can be freed.
+
+    """
+    source = holder.pop()
+    if advance:
+        source = source.cdr()
+    while not source.null():
+        elt = source.car()
+        if not apply_lisp(f, SExp(elt, SExp("NIL")), a_list, d_list).null():
+            rest = [source]
+            return LazyCell(elt,
+                            lambda: filter_from(f, rest, True,
+                                                a_list, d_list))
+        source = source.cdr()
+    return SExp("NIL")
+
+
+def stream_take(n, source):
+    """Returns a lazy list of the first 'n' elements of 'source'. Never
+    looks further into 'source' than it has to, and not at all until
+    the result is looked at.
+
+    """
+    return Delayed(lambda: take_from(n, source))
+
+
+def take_from(n, source):
+    """Takes the first element of 'source', if 'n' is positive, leaving
+    the rest to be taken when it is needed
+
+    """
+    if not n.less(SExp("1")).null() or source.null():
+        return SExp("NIL")
+    remaining = n.minus(SExp("1"))
+    if remaining.greater(SExp("0")).null():
+        return LazyCell(source.car(), lambda: SExp("NIL"))
+    return LazyCell(source.car(), lambda: take_from(remaining, source.cdr()))
+
+
 def in_pairlist(exp, pairlist):
     """Returns true if the s-expression 'exp' appears as the CAR of
     any of the s-expressions in the s-expression 'pairlist'.
@@ -280,6 +405,26 @@ def check_args(f, got_len, exp_len):
         raise error.LispException(msg)
 
 
+def print_sexp(holder, out):
+    """Writes the s-expression in the one-element list 'holder' to the
+    file 'out'. Lists are written one element at a time.
+
+    The holder is emptied first, and the list is walked without keeping
+    its head, so printing a long stream does not hold it in memory.
+
+    """
+    sexp = holder.pop()
+    if sexp.atom() or not sexp.is_list():
+        out.write(str(sexp))
+        return
+    out.write("({0}".format(sexp.car()))
+    sexp = sexp.cdr()
+    while not sexp.null():
+        out.write(" {0}".format(sexp.car()))
+        sexp = sexp.cdr()
+    out.write(")")
+
+
 #TODO: decouple display from the interpreter itself. Allow multiple frontends.
 class bcolors:
     """Colors used in the REPL prompt."""
@@ -312,7 +457,11 @@ if __name__ == "__main__":
         tokens = get_tokens(infile.read())
         for sexp in parse_gen(tokens):
             try:
-                print str(eval_lisp(sexp, SExp("NIL"), d_list))
+                result = [eval_lisp(sexp, SExp("NIL"), d_list)]
+                try:
+                    print_sexp(result, sys.stdout)
+                finally:
+                    print ""
             except error.LispException as inst:
                 print "error: " + inst.args[0]
             except RuntimeError:
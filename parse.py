@@ -5,8 +5,10 @@ The basic approach used by the parser was suggested by Neelam Soundarajan.
 
 """
 
+from collections import deque
+
 from regexes import ATOM_regex, WHITESPACE_regex
-from sexp import SExp
+from sexp import SExp, make_list
 import error
 
 def lex(myinput):
@@ -33,8 +35,11 @@ def lex(myinput):
 
 
 def get_tokens(myinput):
-    """Returns all tokens in myinput"""
-    return [i for i in lex(myinput)]
+    """Returns all tokens in myinput, as a deque so that the parser
+    can consume them from the front cheaply
+
+    """
+    return deque(lex(myinput))
 
 
 def balanced(tokens):
@@ -51,25 +56,26 @@ def balanced(tokens):
     return count == 0
 
 
-def process_list_tokens(tokens):
+def process_list_tokens(tokens, first):
     """
-    Parses tokens in a partial list form into an s-expression
+    Parses tokens in a partial list form into a Python list of
+    s-expressions, starting with the already parsed 'first'
 
     The tokens should have the form ')' 's1)' 's1 s2)' etc
 
     """
-    if len(tokens) == 0:
-        raise error.LispException("parse error: missing tokens")
-    if tokens[0] == ")":
-        tokens.pop(0)
-        return SExp("NIL")
-    first = process_tokens(tokens)
-    if len(tokens) == 0:
-        raise error.LispException("parse error: missing tokens")
-    if tokens[0] == ".":
-        raise error.LispException("mixed notation not supported")
-    second = process_list_tokens(tokens)
-    return SExp(first, second)
+    items = [first]
+    while True:
+        if len(tokens) == 0:
+            raise error.LispException("parse error: missing tokens")
+        if tokens[0] == ")":
+            tokens.popleft()
+            return items
+        items.append(process_tokens(tokens))
+        if len(tokens) == 0:
+            raise error.LispException("parse error: missing tokens")
+        if tokens[0] == ".":
+            raise error.LispException("mixed notation not supported")
 
 
 def process_tokens(tokens):
@@ -81,30 +87,27 @@ def process_tokens(tokens):
     if len(tokens) == 0:
         raise error.LispException("parse error: missing tokens")
     if ATOM_regex.match(tokens[0]):
-        sexp = SExp(tokens.pop(0))
+        sexp = SExp(tokens.popleft())
         return sexp
     if tokens[0] == "(" and tokens[1] == ")":
-        tokens.pop(0)
-        tokens.pop(0)
+        tokens.popleft()
+        tokens.popleft()
         return SExp("NIL")
     #recursively continue
-    if not tokens.pop(0) == "(":
+    if not tokens.popleft() == "(":
         raise error.LispException("missing open parentheses")
     first = process_tokens(tokens)
     if len(tokens) == 0:
         raise error.LispException("parse error: missing tokens")
-    second = []
     if tokens[0] == ".":
-        tokens.pop(0)
+        tokens.popleft()
         second = process_tokens(tokens)
         if len(tokens) == 0:
             raise error.LispException("parse error: missing tokens")
-        if not tokens.pop(0) == ")":
+        if not tokens.popleft() == ")":
             raise error.LispException("missing close parentheses")
-    else:
-        second = process_list_tokens(tokens)
-    sexp = SExp(first, second)
-    return sexp
+        return SExp(first, second)
+    return make_list(process_list_tokens(tokens, first))
 
 
 def parse(tokens):
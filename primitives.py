@@ -16,7 +16,9 @@ from sexp import SExp
 PRIMITIVES_STRING = "T NIL CAR CDR CONS ATOM EQ NULL INT" \
                     "PLUS MINUS TIMES QUOTIENT REMAINDER" \
                     "LESS GREATER COND QUOTE DEFUN HELP" \
-                    "QUIT + - % * / = < >"
+                    "QUIT + - % * / = < >" \
+                    " STREAM-RANGE STREAM-LINES STREAM-MAP" \
+                    " STREAM-FILTER STREAM-TAKE"
 PRIMITIVES = [i for i in PRIMITIVES_STRING.split()]
 
 help_string = """Available primitives:
@@ -48,6 +50,11 @@ HELP = (SExp("HELP"),)
 QUOTE = (SExp("QUOTE"),)
 COND = (SExp("COND"),)
 DEFUN = (SExp("DEFUN"),)
+STREAM_RANGE = (SExp("STREAM-RANGE"),)
+STREAM_LINES = (SExp("STREAM-LINES"),)
+STREAM_MAP = (SExp("STREAM-MAP"),)
+STREAM_FILTER = (SExp("STREAM-FILTER"),)
+STREAM_TAKE = (SExp("STREAM-TAKE"),)
 
 #a list of all primitive s-expressions
 PRIMITIVE_SEXPS = [SExp(i) for i in PRIMITIVES]
@@ -1,6 +1,11 @@
+from array import array
+
 from error import LispException
 from regexes import ATOM_regex, INT_regex
 
+#proper lists read with at least this many elements are packed
+PACK_THRESHOLD = 32
+
 
 class SExp(object):
     """The S-Expression class. Each s-expression can be atomic, or it
@@ -172,4 +177,180 @@ class SExp(object):
         self.val = other.val
 
 
+class ProperList(SExp):
+    """Base class for non-empty proper lists that are not stored as a
+    chain of (CAR . CDR) cells. Subclasses provide car and cdr; lists
+    are walked iteratively, so long ones do not exhaust Python's
+    recursion limit.
+
+    """
+
+    @property
+    def val(self):
+        return (self.car(), self.cdr())
+
+    def atom(self, sexp=False):
+        if sexp:
+            return BOOL_SEXPS[False]
+        return False
+
+    def is_list(self):
+        return True
+
+    def length(self):
+        result = 0
+        cell = self
+        while not cell.null():
+            result += 1
+            cell = cell.cdr()
+        return result
+
+    def _repr_helper(self):
+        result = []
+        cell = self
+        while not cell.null():
+            result.append(" {0}".format(cell.car()))
+            cell = cell.cdr()
+        return "".join(result)
+
+    def __repr__(self):
+        return "({0})".format(self._repr_helper()[1:])
+
+
+class PackedList(ProperList):
+    """A proper list whose elements are stored contiguously, instead of
+    as a chain of (CAR . CDR) cells.
+
+    'items' is either an array of machine ints, for lists of
+    integers, or a Python list holding the strings of atomic elements
+    and the s-expressions of the others. Atoms are only built when an
+    element is looked at. The view starts at 'offset', so CDR shares
+    'items' rather than copying them.
+
+    """
+
+    def __init__(self, items, offset=0):
+        self.items = items
+        self.offset = offset
+
+    def car(self):
+        item = self.items[self.offset]
+        if isinstance(item, SExp):
+            return item
+        return SExp(str(item))
+
+    def cdr(self):
+        if self.offset + 1 == len(self.items):
+            return SExp("NIL")
+        return PackedList(self.items, self.offset + 1)
+
+    def length(self):
+        return len(self.items) - self.offset
+
+
+class LazyCell(ProperList):
+    """A list cell whose CDR is computed only when it is first needed.
+
+    'rest' is a function of no arguments returning the remainder of
+    the list, either NIL or another proper list. Its result is kept, so
+    later calls to CDR return the same s-expression, and it is dropped
+    as soon as no one refers to this cell.
+
+    """
+
+    def __init__(self, first, rest):
+        if not isinstance(first, SExp):
+            raise LispException("not an S-expression")
+        self.first = first
+        self.rest = rest
+        self.forced = None
+
+    def car(self):
+        return self.first
+
+    def cdr(self):
+        if self.rest is not None:
+            # clear 'rest' first, so that whatever it refers to can be
+            # freed while it runs
+            rest = self.rest
+            self.rest = None
+            try:
+                self.forced = rest()
+            except:
+                self.rest = rest
+                raise
+        return self.forced
+
+
+class Delayed(SExp):
+    """An s-expression that is only computed when it is first looked
+    at, by calling 'thunk' with no arguments. Every operation is passed
+    on to the result, which is kept.
+
+    """
+
+    def __init__(self, thunk):
+        self.thunk = thunk
+        self.forced = None
+
+    def force(self):
+        if self.thunk is not None:
+            thunk = self.thunk
+            self.thunk = None
+            try:
+                self.forced = thunk()
+            except:
+                self.thunk = thunk
+                raise
+        return self.forced
+
+    @property
+    def val(self):
+        return self.force().val
+
+    def atom(self, sexp=False):
+        return self.force().atom(sexp)
+
+    def car(self):
+        return self.force().car()
+
+    def cdr(self):
+        return self.force().cdr()
+
+    def is_list(self):
+        return self.force().is_list()
+
+    def length(self):
+        return self.force().length()
+
+    def _repr_helper(self):
+        return self.force()._repr_helper()
+
+    def __repr__(self):
+        return repr(self.force())
+
+
+def _pack(items):
+    """Stores a Python list of s-expressions as compactly as possible"""
+    if all(i.int() and str(int(i.val)) == i.val for i in items):
+        try:
+            return array('l', [int(i.val) for i in items])
+        except OverflowError:
+            pass
+    return [i.val if i.atom() else i for i in items]
+
+
+def make_list(items):
+    """Builds a proper list from a Python list of s-expressions. Long
+    lists become a PackedList; short ones a chain of cells.
+
+    """
+    if len(items) >= PACK_THRESHOLD:
+        return PackedList(_pack(items))
+    result = SExp("NIL")
+    for item in reversed(items):
+        result = SExp(item, result)
+    return result
+
+
 BOOL_SEXPS = {True: SExp("T"), False: SExp("NIL")}